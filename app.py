@@ -1,9 +1,21 @@
 import json
-import uuid
+import os
+import secrets
+from functools import lru_cache
 from datetime import datetime, date, time, timedelta, timezone
 from pathlib import Path
 import streamlit as st
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; stdlib json works the same for our plain dicts
+    orjson = None
+
+try:
+    from streamlit_autorefresh import st_autorefresh as _st_autorefresh
+except ImportError:  # app still works, just without background checks
+    _st_autorefresh = None
+
 # --------------------------- Config ---------------------------
 st.set_page_config(page_title="Sport Trading Reminders (UTC)", page_icon="⏰", layout="wide")
 
@@ -20,8 +32,10 @@ SPORTS = [
 
 DATA_PATH = Path("tasks.json")
 
-# Server-side background check cadence (ms). Keep at 5 minutes as requested.
+# Server-side background check cadence (ms). Keep at 5 minutes as requested (upper bound).
 AUTO_REFRESH_MS = 300_000
+# Lower bound when a reminder is about to fire, so we never poll too aggressively.
+MIN_REFRESH_MS = 5_000
 
 # --------------------------- Helpers ---------------------------
 def now_utc() -> datetime:
@@ -30,103 +44,236 @@ def now_utc() -> datetime:
 def iso(dt: datetime) -> str:
     return dt.astimezone(timezone.utc).isoformat(timespec="seconds")
 
+@lru_cache(maxsize=4096)
 def parse_iso(s: str) -> datetime:
     return datetime.fromisoformat(s)
 
+def dumps_tasks(tasks: list[dict], pretty: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(tasks, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(tasks, indent=2).encode("utf-8")
+    return json.dumps(tasks, separators=(",", ":")).encode("utf-8")
+
+def loads_tasks(raw: bytes) -> list[dict]:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+@st.cache_data(show_spinner=False)
+def _read_tasks(mtime_ns: int) -> list[dict]:
+    # mtime_ns is only the cache key: reread only when the file changes on disk
+    try:
+        return loads_tasks(DATA_PATH.read_bytes())
+    except Exception:
+        return []
+
 def load_tasks() -> list[dict]:
-    if DATA_PATH.exists():
-        try:
-            return json.loads(DATA_PATH.read_text(encoding="utf-8"))
-        except Exception:
-            return []
-    return []
+    try:
+        mtime_ns = DATA_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return []
+    return _read_tasks(mtime_ns)
 
 def save_tasks(tasks: list[dict]) -> None:
-    DATA_PATH.write_text(json.dumps(tasks, indent=2), encoding="utf-8")
+    # Compact JSON, written to a temp file and swapped in atomically
+    before = DATA_PATH.stat().st_mtime_ns if DATA_PATH.exists() else None
+    tmp = DATA_PATH.with_name(DATA_PATH.name + ".tmp")
+    tmp.write_bytes(dumps_tasks(tasks))
+    os.replace(tmp, DATA_PATH)
+    if DATA_PATH.stat().st_mtime_ns != before:
+        _read_tasks.clear()
+
+def mark_dirty():
+    st.session_state._dirty = True
+
+def flush_tasks():
+    """Write tasks once per rerun, only if something changed."""
+    if st.session_state.get("_dirty"):
+        save_tasks(st.session_state.tasks)
+        st.session_state._dirty = False
 
 def ensure_state():
     if "tasks" not in st.session_state:
         st.session_state.tasks = load_tasks()
+    for t in st.session_state.tasks:
+        # Backfill epoch seconds for tasks saved (or loaded into this session) before when_ts existed
+        if "when_ts" not in t:
+            t["when_ts"] = int(parse_iso(t["when_utc"]).timestamp())
+    if "tasks_by_id" not in st.session_state:
+        st.session_state.tasks_by_id = {t["id"]: t for t in st.session_state.tasks}
+    # Partitioned once here and kept up to date by the mutation helpers
+    if "tasks_active" not in st.session_state:
+        st.session_state.tasks_active = [t for t in st.session_state.tasks if not t["done"]]
+    if "tasks_done" not in st.session_state:
+        st.session_state.tasks_done = [t for t in st.session_state.tasks if t["done"]]
+    if "_dirty" not in st.session_state:
+        st.session_state._dirty = False
     if "sound_enabled" not in st.session_state:
         st.session_state.sound_enabled = False
 
+def new_task_id() -> str:
+    # Millisecond timestamp + short random suffix; plain string like the old uuid ids
+    return f"{int(now_utc().timestamp() * 1000):x}{secrets.token_hex(3)}"
+
 def add_task(sport: str, txt: str, dt_utc: datetime):
     t = {
-        "id": str(uuid.uuid4()),
+        "id": new_task_id(),
         "sport": sport,
         "text": txt.strip(),
         "when_utc": iso(dt_utc),
+        "when_ts": int(dt_utc.timestamp()),
         "created_utc": iso(now_utc()),
         "done": False,
         "alerted": False,
         "snoozed_minutes": 0,
     }
     st.session_state.tasks.append(t)
-    save_tasks(st.session_state.tasks)
+    st.session_state.tasks_by_id[t["id"]] = t
+    st.session_state.tasks_active.append(t)
+    mark_dirty()
 
 def snooze_task(task_id: str, minutes: int = 5):
-    for t in st.session_state.tasks:
-        if t["id"] == task_id:
-            when = parse_iso(t["when_utc"])
-            t["when_utc"] = iso(when + timedelta(minutes=minutes))
-            t["alerted"] = False
-            t["snoozed_minutes"] = t.get("snoozed_minutes", 0) + minutes
-            break
-    save_tasks(st.session_state.tasks)
+    t = st.session_state.tasks_by_id.get(task_id)
+    if t is None:
+        return
+    t["when_ts"] += minutes * 60
+    t["when_utc"] = datetime.fromtimestamp(t["when_ts"], timezone.utc).isoformat(timespec="seconds")
+    t["alerted"] = False
+    t["snoozed_minutes"] = t.get("snoozed_minutes", 0) + minutes
+    mark_dirty()
 
 def mark_done(task_id: str):
-    for t in st.session_state.tasks:
-        if t["id"] == task_id:
-            t["done"] = True
-            break
-    save_tasks(st.session_state.tasks)
+    t = st.session_state.tasks_by_id.get(task_id)
+    if t is None or t["done"]:
+        return
+    t["done"] = True
+    st.session_state.tasks_active.remove(t)
+    st.session_state.tasks_done.append(t)
+    mark_dirty()
 
 def delete_task(task_id: str):
-    st.session_state.tasks = [t for t in st.session_state.tasks if t["id"] != task_id]
-    save_tasks(st.session_state.tasks)
+    t = st.session_state.tasks_by_id.pop(task_id, None)
+    if t is None:
+        return
+    st.session_state.tasks.remove(t)
+    (st.session_state.tasks_done if t["done"] else st.session_state.tasks_active).remove(t)
+    mark_dirty()
 
 def format_dt(dt: datetime) -> str:
     return dt.strftime("%Y-%m-%d %H:%M:%S UTC")
 
-def due_status(t: dict, nowt: datetime) -> str:
+@lru_cache(maxsize=4096)
+def format_ts(ts: int) -> str:
+    # Same task time is shown in several places per rerun; format it once
+    return format_dt(datetime.fromtimestamp(ts, timezone.utc))
+
+def due_status(t: dict, nowt_ts: int) -> str:
     if t["done"]:
         return "✅ Done"
-    when = parse_iso(t["when_utc"])
-    if nowt >= when:
+    when_ts = t["when_ts"]
+    if nowt_ts >= when_ts:
         return "🔔 Due"
     else:
-        mins = int((when - nowt).total_seconds() // 60)
+        mins = (when_ts - nowt_ts) // 60
         return f"⏳ In {mins} min"
 
 # --------------------------- UI: UTC live clock ---------------------------
+# Component markup is static, so build it once at import rather than per rerun.
+_CLOCK_HTML = """
+<div style="display:flex;justify-content:flex-end;margin-bottom:.25rem">
+  <div style="font:600 16px/1.2 system-ui,-apple-system,Segoe UI,Roboto,Helvetica,Arial,sans-serif;
+              font-variant-numeric:tabular-nums;letter-spacing:.5px">
+    <span style="opacity:.7;margin-right:.4rem;">UTC</span>
+    <strong id="utc-time">--:--:--</strong>
+  </div>
+</div>
+<script>
+  function pad(n){return n.toString().padStart(2,'0');}
+  function tick(){
+    const d=new Date();
+    const s=`${d.getUTCFullYear()}-${pad(d.getUTCMonth()+1)}-${pad(d.getUTCDate())} `+
+            `${pad(d.getUTCHours())}:${pad(d.getUTCMinutes())}:${pad(d.getUTCSeconds())}`;
+    const el=document.getElementById("utc-time");
+    if(el) el.textContent=s;
+  }
+  tick(); setInterval(tick,1000);
+</script>
+"""
+
 def live_utc_clock():
-    # Proper component so scripts always run
-    st.components.v1.html(
-        """
-        <div style="display:flex;justify-content:flex-end;margin-bottom:.25rem">
-          <div style="font:600 16px/1.2 system-ui,-apple-system,Segoe UI,Roboto,Helvetica,Arial,sans-serif;
-                      font-variant-numeric:tabular-nums;letter-spacing:.5px">
-            <span style="opacity:.7;margin-right:.4rem;">UTC</span>
-            <strong id="utc-time">--:--:--</strong>
-          </div>
-        </div>
-        <script>
-          function pad(n){return n.toString().padStart(2,'0');}
-          function tick(){
-            const d=new Date();
-            const s=`${d.getUTCFullYear()}-${pad(d.getUTCMonth()+1)}-${pad(d.getUTCDate())} `+
-                    `${pad(d.getUTCHours())}:${pad(d.getUTCMinutes())}:${pad(d.getUTCSeconds())}`;
-            const el=document.getElementById("utc-time");
-            if(el) el.textContent=s;
-          }
-          tick(); setInterval(tick,1000);
-        </script>
-        """,
-        height=28,
-    )
+    # Proper component so scripts always run. Emitted every rerun with identical
+    # arguments at a fixed position, so the frontend keeps the same iframe.
+    st.components.v1.html(_CLOCK_HTML, height=28)
 
 # --------------------------- UI: Sound priming & alarm ---------------------------
-def sound_enable_banner():
+_SOUND_INIT_HTML = """
+<script>
+  (function(){
+    try {
+      const Ctor = window.AudioContext || window.webkitAudioContext;
+      const ctx = new Ctor();
+      // Keep-alive: resume periodically & on visibility change
+      function ensureResume(){
+        if (ctx.state === 'suspended') { ctx.resume(); }
+      }
+      ensureResume();
+      setInterval(ensureResume, 15000);
+      document.addEventListener('visibilitychange', ensureResume);
+      window._alarmCtx = ctx;
+    } catch(e) { console.log('Audio init error', e); }
+  })();
+</script>
+"""
+
+_ALARM_HTML = """
+<script>
+  (function(){
+    try {
+      const Ctor = window.AudioContext || window.webkitAudioContext;
+      const ctx = window._alarmCtx || new Ctor();
+      if (ctx.state === 'suspended') { ctx.resume(); }
+
+      const osc1 = ctx.createOscillator(); // 880 Hz
+      const osc2 = ctx.createOscillator(); // 660 Hz
+      const gain = ctx.createGain();       // master
+      const trem = ctx.createOscillator(); // amplitude modulation
+      const tremGain = ctx.createGain();
+
+      osc1.type = 'square';
+      osc2.type = 'square';
+      osc1.frequency.value = 880;
+      osc2.frequency.value = 660;
+
+      gain.gain.setValueAtTime(0.0001, ctx.currentTime);
+
+      // Tremolo ~6 Hz for "urgent" feel
+      trem.frequency.value = 6;
+      tremGain.gain.value = 0.5;
+      trem.connect(tremGain);
+      tremGain.connect(gain.gain);
+
+      osc1.connect(gain);
+      osc2.connect(gain);
+      gain.connect(ctx.destination);
+
+      // Fade in quickly, play 6 seconds, fade out
+      const t0 = ctx.currentTime + 0.01;
+      gain.gain.exponentialRampToValueAtTime(0.6, t0 + 0.05);
+
+      osc1.start(t0);
+      osc2.start(t0 + 0.02);
+      trem.start(t0);
+
+      const tEnd = t0 + 6.0;
+      gain.gain.exponentialRampToValueAtTime(0.0001, tEnd - 0.1);
+      osc1.stop(tEnd);
+      osc2.stop(tEnd);
+      trem.stop(tEnd);
+    } catch(e) { console.log('Alarm error', e); }
+  })();
+</script>
+"""
+
+def sound_enable_banner(slot):
     """
     One-time button to grant audio permission and keep the audio context alive
     (auto-resume on visibility changes so background alarms work).
@@ -137,85 +284,102 @@ def sound_enable_banner():
 
     if st.session_state.sound_enabled:
         st.success("Sound enabled for background alarms.")
-        st.components.v1.html(
-            """
-            <script>
-              (function(){
-                try {
-                  const Ctor = window.AudioContext || window.webkitAudioContext;
-                  const ctx = new Ctor();
-                  // Keep-alive: resume periodically & on visibility change
-                  function ensureResume(){
-                    if (ctx.state === 'suspended') { ctx.resume(); }
-                  }
-                  ensureResume();
-                  setInterval(ensureResume, 15000);
-                  document.addEventListener('visibilitychange', ensureResume);
-                  window._alarmCtx = ctx;
-                } catch(e) { console.log('Audio init error', e); }
-              })();
-            </script>
-            """,
-            height=0,
-        )
+        # Re-emitted every rerun with identical markup in a fixed slot so the frontend
+        # keeps the same iframe (and its AudioContext + resume timer) alive
+        with slot:
+            st.components.v1.html(_SOUND_INIT_HTML, height=0)
 
-def play_long_alarm():
+def play_long_alarm(slot):
     """
     6-second pulsing dual-tone (880Hz + 660Hz) with tremolo—noticeable, even in background.
     Requires sound to be enabled earlier.
     """
     if not st.session_state.get("sound_enabled"):
         return
-    st.components.v1.html(
-        """
-        <script>
-          (function(){
-            try {
-              const Ctor = window.AudioContext || window.webkitAudioContext;
-              const ctx = window._alarmCtx || new Ctor();
-              if (ctx.state === 'suspended') { ctx.resume(); }
-
-              const osc1 = ctx.createOscillator(); // 880 Hz
-              const osc2 = ctx.createOscillator(); // 660 Hz
-              const gain = ctx.createGain();       // master
-              const trem = ctx.createOscillator(); // amplitude modulation
-              const tremGain = ctx.createGain();
-
-              osc1.type = 'square';
-              osc2.type = 'square';
-              osc1.frequency.value = 880;
-              osc2.frequency.value = 660;
-
-              gain.gain.setValueAtTime(0.0001, ctx.currentTime);
-
-              // Tremolo ~6 Hz for "urgent" feel
-              trem.frequency.value = 6;
-              tremGain.gain.value = 0.5;
-              trem.connect(tremGain);
-              tremGain.connect(gain.gain);
-
-              osc1.connect(gain);
-              osc2.connect(gain);
-              gain.connect(ctx.destination);
-
-              // Fade in quickly, play 6 seconds, fade out
-              const t0 = ctx.currentTime + 0.01;
-              gain.gain.exponentialRampToValueAtTime(0.6, t0 + 0.05);
-
-              osc1.start(t0);
-              osc2.start(t0 + 0.02);
-              trem.start(t0);
-
-              const tEnd = t0 + 6.0;
-              gain.gain.exponentialRampToValueAtTime(0.0001, tEnd - 0.1);
-              osc1.stop(tEnd);
-              osc2.stop(tEnd);
-              trem.stop(tEnd);
-            } catch(e) { console.log('Alarm error', e); }
-          })();
-        </script>
-        """,
-        height=0,
+    with slot:
+        st.components.v1.html(_ALARM_HTML, height=0)
+
+# --------------------------- UI: Add reminders & board actions ---------------------------
+# Fragments rerun only their own widgets (st.fragment on 1.37+, experimental before);
+# on older Streamlit this degrades to plain full-script reruns.
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda f: f)
+
+@fragment
+def add_reminders():
+    """
+    Per-sport add forms. Typing/picking only reruns this section; a successful
+    add triggers a full rerun so the boards (and the end-of-run flush) see it.
+    """
+    st.subheader("Add reminders (UTC)")
+    today_utc = now_utc().date()
+    added = st.session_state.pop("_added_msg", None)
+    for sport in SPORTS:
+        with st.expander(f"➕ {sport}", expanded=False):
+            c1, c2, c3, c4 = st.columns([1.0, 1.0, 2.2, 1.2])
+
+            with c1:
+                d = st.date_input(f"Date (UTC) – {sport}", value=today_utc, key=f"{sport}_date")
+            with c2:
+                tm = st.time_input(
+                    f"Time (UTC) – {sport}",
+                    value=time(0, 0),
+                    key=f"{sport}_time",
+                    step=timedelta(minutes=5),
+                )
+            with c3:
+                txt = st.text_input(
+                    f"Action / note – {sport}",
+                    placeholder="e.g., goes live; freeze groups; freeze main market; settle score; trade live…",
+                    key=f"{sport}_text",
+                )
+            with c4:
+                if st.button("Add", key=f"{sport}_add"):
+                    if txt.strip():
+                        dt_utc = datetime.combine(d, tm).replace(tzinfo=timezone.utc)
+                        add_task(sport, txt, dt_utc)
+                        st.session_state._added_msg = (sport, f"Added for {sport} at {format_dt(dt_utc)}")
+                        st.rerun()
+                    else:
+                        st.warning("Please enter an action/note.")
+                if added and added[0] == sport:
+                    st.success(added[1])
+
+@fragment
+def board_actions(tasks: list[dict], prefix: str):
+    """
+    One task picker + three buttons per board, instead of a button row per task.
+    Picking reruns only this fragment; an action reruns the app so every board updates.
+    """
+    labels = {t["id"]: f"{t['sport']} — {t['text']} ({format_ts(t['when_ts'])})" for t in tasks}
+    c0, c1, c2, c3 = st.columns([3, 1, 1, 1])
+    with c0:
+        task_id = st.selectbox(
+            "Reminder",
+            options=list(labels),
+            index=None,  # actions need an explicit pick, never a silent fallback to row 0
+            placeholder="Pick a reminder…",
+            format_func=lambda i: labels.get(i, i),
+            key=f"{prefix}_selected",
+            label_visibility="collapsed",
+        )
+    action = None
+    with c1:
+        if st.button("✅ Mark done", key=f"{prefix}_done"):
+            action = mark_done
+    with c2:
+        if st.button("⏱️ Snooze +5m", key=f"{prefix}_snooze"):
+            action = snooze_task
+    with c3:
+        if st.button("🗑️ Delete", key=f"{prefix}_del"):
+            action = delete_task
+    if action is not None and task_id is not None:
+        action(task_id)
+        st.rerun()
+
+def app_footer():
+    st.markdown("---")
+    st.caption(
+        "For background alarms: click “Enable sound” once, keep this tab unmuted, and exclude it from any tab-sleep features."
     )
 
 # --------------------------- App ---------------------------
@@ -226,110 +390,118 @@ st.title("⏰ Sport Trading Reminders (UTC)")
 # Live UTC clock (always visible, 1s updates)
 live_utc_clock()
 
-# One-time sound enable (do this once at the start of your shift)
-sound_enable_banner()
+# Fixed slots for the audio iframes, so the alarm (or sound priming) appearing
+# doesn't shift (and remount) the elements below
+sound_slot = st.empty()
+alarm_slot = st.empty()
 
-# Silent server-side auto-check every 5 minutes
-try:
-    from streamlit_autorefresh import st_autorefresh
-    st_autorefresh(interval=AUTO_REFRESH_MS, key="auto_check_5m")
-except Exception:
-    pass
+# One-time sound enable (do this once at the start of your shift)
+sound_enable_banner(sound_slot)
 
 st.markdown("---")
 
 # Add reminders
-st.subheader("Add reminders (UTC)")
-today_utc = now_utc().date()
-for sport in SPORTS:
-    with st.expander(f"➕ {sport}", expanded=False):
-        c1, c2, c3, c4 = st.columns([1.0, 1.0, 2.2, 1.2])
-
-        with c1:
-            d = st.date_input(f"Date (UTC) – {sport}", value=today_utc, key=f"{sport}_date")
-        with c2:
-            tm = st.time_input(
-                f"Time (UTC) – {sport}",
-                value=time(0, 0),
-                key=f"{sport}_time",
-                step=timedelta(minutes=5),
-            )
-        with c3:
-            txt = st.text_input(
-                f"Action / note – {sport}",
-                placeholder="e.g., goes live; freeze groups; freeze main market; settle score; trade live…",
-                key=f"{sport}_text",
-            )
-        with c4:
-            if st.button("Add", key=f"{sport}_add"):
-                if txt.strip():
-                    dt_utc = datetime.combine(d, tm).replace(tzinfo=timezone.utc)
-                    add_task(sport, txt, dt_utc)
-                    st.success(f"Added for {sport} at {format_dt(dt_utc)}")
-                else:
-                    st.warning("Please enter an action/note.")
+add_reminders()
 
 st.markdown("---")
 
-# Boards
-nowt = now_utc()
-tasks_sorted = sorted(st.session_state.tasks, key=lambda t: (parse_iso(t["when_utc"]), t["sport"]))
-due_tasks = [t for t in tasks_sorted if (not t["done"]) and nowt >= parse_iso(t["when_utc"])]
-upcoming_tasks = [t for t in tasks_sorted if (not t["done"]) and nowt < parse_iso(t["when_utc"])]
-done_tasks = [t for t in tasks_sorted if t["done"]]
+# Boards (nothing to bucket, alarm or poll for when there are no reminders)
+if not st.session_state.tasks:
+    st.info("No reminders yet.")
+    app_footer()
+    flush_tasks()  # a delete of the last reminder still needs writing
+    st.stop()
+
+nowt_ts = int(now_utc().timestamp())
+# Done items are already partitioned; only active ones need the due/upcoming split
+due_tasks, upcoming_tasks = [], []
+for t in st.session_state.tasks_active:
+    if nowt_ts >= t["when_ts"]:
+        due_tasks.append(t)
+    else:
+        upcoming_tasks.append(t)
+board_key = lambda t: (t["when_ts"], t["sport"])
+due_tasks.sort(key=board_key)
+upcoming_tasks.sort(key=board_key)
+done_tasks = sorted(st.session_state.tasks_done, key=board_key)
+
+# Silent server-side auto-check: every 5 minutes, sooner if something is about to be due
+refresh_ms = AUTO_REFRESH_MS
+if upcoming_tasks:
+    next_due_secs = upcoming_tasks[0]["when_ts"] - nowt_ts
+    refresh_ms = max(MIN_REFRESH_MS, min(AUTO_REFRESH_MS, next_due_secs * 1000 + 500))
+if _st_autorefresh is not None:
+    try:
+        _st_autorefresh(interval=refresh_ms, key="auto_check_5m")
+    except Exception:
+        pass
 
 # Play long alarm for newly-due items (only once per item)
 newly_due = [t for t in due_tasks if not t.get("alerted", False)]
 if newly_due:
     for t in newly_due:
         t["alerted"] = True
-    save_tasks(st.session_state.tasks)
-    play_long_alarm()
+    mark_dirty()
+    play_long_alarm(alarm_slot)
     st.toast(f"🔔 {len(newly_due)} reminder(s) due now", icon="🔔")
 
 st.subheader("🔔 Due now")
 if not due_tasks:
     st.info("No due reminders at the moment.")
 else:
-    for t in due_tasks:
-        with st.container(border=True):
-            when = parse_iso(t["when_utc"])
-            st.markdown(f"**{t['sport']}** — {t['text']}")
-            st.caption(f"Scheduled: {format_dt(when)}")
-            c1, c2, c3 = st.columns([1, 1, 1])
-            with c1:
-                st.button("✅ Mark done", key=f"done_{t['id']}", on_click=mark_done, args=(t["id"],))
-            with c2:
-                st.button("⏱️ Snooze +5m", key=f"snooze_{t['id']}", on_click=snooze_task, args=(t["id"], 5))
-            with c3:
-                st.button("🗑️ Delete", key=f"del_{t['id']}", on_click=delete_task, args=(t["id"],))
+    st.dataframe(
+        [
+            {"Sport": t["sport"], "Action": t["text"], "Scheduled": format_ts(t["when_ts"])}
+            for t in due_tasks
+        ],
+        width="stretch",
+        hide_index=True,
+    )
+    board_actions(due_tasks, "due")
 
 st.subheader("⏳ Upcoming (UTC)")
 if not upcoming_tasks:
     st.info("Nothing upcoming.")
 else:
-    for t in upcoming_tasks:
-        with st.container(border=True):
-            when = parse_iso(t["when_utc"])
-            st.markdown(f"**{t['sport']}** — {t['text']}")
-            st.caption(f"Scheduled: {format_dt(when)} • {due_status(t, nowt)} • Snoozed: {t.get('snoozed_minutes',0)} min")
-            c1, c2, c3 = st.columns([1, 1, 1])
-            with c1:
-                st.button("✅ Mark done", key=f"udone_{t['id']}", on_click=mark_done, args=(t["id"],))
-            with c2:
-                st.button("⏱️ Snooze +5m", key=f"usnooze_{t['id']}", on_click=snooze_task, args=(t["id"], 5))
-            with c3:
-                st.button("🗑️ Delete", key=f"udel_{t['id']}", on_click=delete_task, args=(t["id"],))
+    st.dataframe(
+        [
+            {
+                "Sport": t["sport"],
+                "Action": t["text"],
+                "Scheduled": format_ts(t["when_ts"]),
+                "Status": due_status(t, nowt_ts),
+                "Snoozed (min)": t.get("snoozed_minutes", 0),
+            }
+            for t in upcoming_tasks
+        ],
+        width="stretch",
+        hide_index=True,
+    )
+    board_actions(upcoming_tasks, "upcoming")
 
 with st.expander("✔️ Completed"):
     if not done_tasks:
         st.caption("No completed items yet.")
     else:
-        for t in done_tasks:
-            when = parse_iso(t["when_utc"])
-            st.write(f"• **{t['sport']}** — {t['text']}  _(scheduled {format_dt(when)})_")
+        st.dataframe(
+            [
+                {"Sport": t["sport"], "Action": t["text"], "Scheduled": format_ts(t["when_ts"])}
+                for t in done_tasks
+            ],
+            width="stretch",
+            hide_index=True,
+        )
 
-st.markdown("---")
-st.caption(
-    "For background alarms: click “Enable sound” once, keep this tab unmuted, and exclude it from any tab-sleep features."
-)
+# Pretty-printed export is built only on request, not on every (auto-)rerun
+if st.button("📦 Prepare export", key="prepare_export"):
+    st.download_button(
+        "⬇️ Export tasks (JSON)",
+        data=dumps_tasks(st.session_state.tasks, pretty=True),
+        file_name="tasks.json",
+        mime="application/json",
+    )
+
+app_footer()
+
+# Single write for everything changed during this rerun
+flush_tasks()